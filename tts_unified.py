@@ -7,12 +7,24 @@ Supports Google TTS and Piper TTS engines
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import threading
+import concurrent.futures
+import queue
+import collections
+import contextlib
+import hashlib
 import os
 import sys
+import io
+import time
+import json
+import wave
 import tempfile
+import shutil
 import subprocess
-from typing import Optional, Callable
+import urllib.request
+from typing import Optional, Callable, List, Tuple
 from abc import ABC, abstractmethod
+from enum import Enum
 
 # Required imports
 try:
@@ -27,13 +39,65 @@ try:
 except ImportError:
     PYGAME_AVAILABLE = False
 
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+try:
+    import numpy as np
+    import onnxruntime as ort
+    from piper import PiperVoice
+    from piper.config import PiperConfig
+    PIPER_AVAILABLE = True
+except ImportError:
+    PIPER_AVAILABLE = False
+
+# Mixer buffer size in samples; small to keep playback start latency low
+MIXER_BUFFER_SAMPLES = 512
+
+
+def cpu_has_vnni() -> bool:
+    """Check for VNNI int8 dot-product instructions (Linux only)"""
+    try:
+        with open("/proc/cpuinfo", "r") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("flags"):
+                    flags = line.split()
+                    return "avx512_vnni" in flags or "avx_vnni" in flags
+    except OSError:
+        pass
+    return False
+
+
+def sha256_file(path: str) -> str:
+    """Hash a file with SHA-256 without reading it into memory at once"""
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+class EngineId(Enum):
+    """Engine identifiers, valued by their key in UnifiedTTSApp.engines"""
+    PIPER = 'piper'
+    GOOGLE = 'google'
+
 
 class TTSEngine(ABC):
     """Abstract base class for TTS engines"""
     
+    def __init__(self):
+        # Set by stop() to end playback early
+        self._stop_evt = threading.Event()
+    
     @abstractmethod
-    def speak(self, text: str, speed: float, callback: Optional[Callable] = None) -> None:
-        """Generate and play speech from text"""
+    def speak(self, text: str, speed: float, callback: Optional[Callable] = None) -> Optional[bytes]:
+        """Generate and play speech from text, returning the PCM that was played"""
         pass
     
     @abstractmethod
@@ -50,49 +114,56 @@ class TTSEngine(ABC):
     def get_name(self) -> str:
         """Get the display name of this engine"""
         pass
+    
+    def _play_until_done(self, sound: "pygame.mixer.Sound") -> None:
+        """Play a sound and block until it finishes or stop() is called"""
+        if self._stop_evt.is_set():
+            return
+        
+        channel = sound.play()
+        if self._stop_evt.wait(timeout=sound.get_length()):
+            channel.stop()
+    
+    def play_pcm(self, pcm: bytes, callback: Optional[Callable] = None) -> None:
+        """Play PCM previously returned by speak() without synthesizing it again"""
+        self._stop_evt.clear()
+        try:
+            self._play_until_done(pygame.mixer.Sound(buffer=pcm))
+        finally:
+            if callback:
+                callback()
 
 
 class GoogleTTSEngine(TTSEngine):
     """Google TTS using gTTS"""
     
     def __init__(self):
-        self.is_playing = False
-        self.current_audio_file = None
-        if PYGAME_AVAILABLE:
-            pygame.mixer.init()
+        super().__init__()
     
-    def speak(self, text: str, speed: float, callback: Optional[Callable] = None, language: str = "en") -> None:
+    def speak(self, text: str, speed: float, callback: Optional[Callable] = None, language: str = "en") -> Optional[bytes]:
         if not GTTS_AVAILABLE or not PYGAME_AVAILABLE:
             raise Exception("gTTS or pygame not available")
         
-        self.is_playing = True
+        self._stop_evt.clear()
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
-                self.current_audio_file = tmp_file.name
-            
             slow = speed < 1.0
             tts = gTTS(text=text, lang=language, slow=slow)
-            tts.save(self.current_audio_file)
-            
-            pygame.mixer.music.load(self.current_audio_file)
-            pygame.mixer.music.play()
+            mp3_buffer = io.BytesIO()
+            tts.write_to_fp(mp3_buffer)
+            mp3_buffer.seek(0)
             
-            while pygame.mixer.music.get_busy() and self.is_playing:
-                pygame.time.Clock().tick(10)
+            # Decode the MP3 to PCM once, in memory
+            sound = pygame.mixer.Sound(file=mp3_buffer)
+            self._play_until_done(sound)
+            return sound.get_raw()
         finally:
-            self.is_playing = False
-            if self.current_audio_file and os.path.exists(self.current_audio_file):
-                try:
-                    os.unlink(self.current_audio_file)
-                except:
-                    pass
             if callback:
                 callback()
     
     def stop(self) -> None:
-        self.is_playing = False
+        self._stop_evt.set()
         if PYGAME_AVAILABLE:
-            pygame.mixer.music.stop()
+            pygame.mixer.stop()
     
     def is_available(self) -> bool:
         return GTTS_AVAILABLE and PYGAME_AVAILABLE
@@ -105,106 +176,328 @@ class PiperTTSEngine(TTSEngine):
     """Piper TTS for offline high-quality speech"""
     
     def __init__(self):
-        self.is_playing = False
-        self.current_audio_file = None
+        super().__init__()
+        self.voice = None
+        self.sess = None
+        self._installed_cached: Optional[bool] = None
+        self._available_cached: Optional[bool] = None
+        self._piper_command: Optional[str] = None
         self.piper_dir = os.path.expanduser("~/.local/share/piper")
         self.voice_model = os.path.join(self.piper_dir, "en_US-norman-medium.onnx")
         self.voice_config = os.path.join(self.piper_dir, "en_US-norman-medium.onnx.json")
-        if PYGAME_AVAILABLE:
-            pygame.mixer.init()
+        self.voice_model_int8 = self.voice_model.replace(".onnx", "_int8.onnx")
+        # Without VNNI the INT8 model can be slower than FP32, so only use it when supported
+        self.use_int8 = cpu_has_vnni()
+        if PIPER_AVAILABLE and os.path.exists(self.voice_model):
+            try:
+                self.load_voice()
+            except Exception:
+                # Fall back to the piper command if the model can't be loaded
+                self.voice = None
+                self.sess = None
+    
+    def load_voice(self) -> None:
+        """Load the voice model once into a persistent ONNX Runtime session"""
+        with open(self.voice_config, "r", encoding="utf-8") as config_file:
+            config = PiperConfig.from_dict(json.load(config_file))
+        
+        model_path = self.get_model_path()
+        if model_path == self.voice_model_int8:
+            try:
+                self.sess = self._create_session(model_path)
+                self.voice = PiperVoice(session=self.sess, config=config)
+                # Quantized ops may be missing from the provider, so run once before relying on them
+                self.sess.run(None, self._dummy_inputs())
+                return
+            except Exception as e:
+                print(f"INT8 voice model unusable, using FP32 instead: {e}", file=sys.stderr)
+                if os.path.exists(self.voice_model_int8):
+                    os.unlink(self.voice_model_int8)
+                model_path = self.voice_model
+        
+        self.sess = self._create_session(model_path)
+        self.voice = PiperVoice(session=self.sess, config=config)
+    
+    def _create_session(self, model_path: str) -> "ort.InferenceSession":
+        """Create an ONNX Runtime session for the given model"""
+        so = ort.SessionOptions()
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        so.intra_op_num_threads = os.cpu_count() or 0
+        
+        if "OpenVINOExecutionProvider" in ort.get_available_providers():
+            # Compiled kernels are cached on disk so later launches skip graph compilation
+            openvino_options = {
+                "device_type": "CPU",
+                "cache_dir": os.path.join(self.piper_dir, "ov_cache")
+            }
+            if model_path != self.voice_model_int8:
+                openvino_options["precision"] = "FP32"
+            try:
+                return ort.InferenceSession(
+                    model_path,
+                    so,
+                    providers=[("OpenVINOExecutionProvider", openvino_options), "CPUExecutionProvider"]
+                )
+            except Exception as e:
+                print(f"OpenVINO session failed, using the default CPU provider: {e}", file=sys.stderr)
+        
+        return ort.InferenceSession(model_path, so, providers=["CPUExecutionProvider"])
+    
+    def _dummy_inputs(self) -> dict:
+        """Build a minimal one-phoneme input for warming up the session"""
+        config = self.voice.config
+        phoneme_ids = self.voice.phonemes_to_ids(["a"])
+        inputs = {
+            "input": np.array([phoneme_ids], dtype=np.int64),
+            "input_lengths": np.array([len(phoneme_ids)], dtype=np.int64),
+            "scales": np.array([config.noise_scale, config.length_scale, config.noise_w], dtype=np.float32)
+        }
+        if config.num_speakers > 1:
+            inputs["sid"] = np.array([0], dtype=np.int64)
+        return inputs
     
-    def speak(self, text: str, speed: float, callback: Optional[Callable] = None) -> None:
+    def get_model_path(self) -> str:
+        """Get the model to run, preferring the INT8 variant on CPUs that benefit"""
+        if self.use_int8 and os.path.exists(self.voice_model_int8):
+            return self.voice_model_int8
+        return self.voice_model
+    
+    def quantize_model(self) -> None:
+        """Produce an INT8 dynamic-quantized copy of the voice model"""
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        
+        # Only the matrix multiplies: Conv would become ConvInteger, which the CPU provider
+        # doesn't implement for int8 weights
+        quantize_dynamic(
+            self.voice_model,
+            self.voice_model_int8,
+            op_types_to_quantize=["MatMul", "Gemm"],
+            weight_type=QuantType.QInt8
+        )
+    
+    def speak(self, text: str, speed: float, callback: Optional[Callable] = None) -> Optional[bytes]:
         if not self.is_available():
             raise Exception("Piper TTS not available")
         
-        self.is_playing = True
+        self._stop_evt.clear()
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-                self.current_audio_file = tmp_file.name
-            
             length_scale = 1.0 / speed
             
+            if self.voice is not None:
+                chunks = self.voice.synthesize_stream_raw(text, length_scale=length_scale)
+                return self._play_stream(chunks, self.voice.config.sample_rate)
+            
+            sound = self._synthesize_with_command(text, length_scale)
+            self._play_until_done(sound)
+            return sound.get_raw()
+        finally:
+            if callback:
+                callback()
+    
+    def _play_stream(self, chunks, sample_rate: int) -> Optional[bytes]:
+        """Play PCM chunks as they are synthesized, returning all of it unless stopped"""
+        channel = pygame.mixer.find_channel(True)
+        played = []
+        busy_until = time.monotonic()
+        queued_length = 0.0
+        
+        for chunk in chunks:
+            if self._stop_evt.is_set():
+                break
+            
+            sound = self._make_sound(chunk, sample_rate)
+            played.append(sound.get_raw())
+            
+            if not channel.get_busy():
+                channel.play(sound)
+                busy_until = time.monotonic() + sound.get_length()
+                queued_length = 0.0
+                continue
+            
+            # A channel holds only one queued sound, so sleep until the playing one should end
+            # plus one mixer buffer for the hand-off. The loop only repeats if that estimate
+            # ran early, and then waits one buffer at a time rather than polling quickly.
+            buffer_length = MIXER_BUFFER_SAMPLES / pygame.mixer.get_init()[0]
+            slot_free_at = busy_until - queued_length + buffer_length
+            while channel.get_queue() is not None:
+                if self._stop_evt.wait(timeout=max(buffer_length, slot_free_at - time.monotonic())):
+                    break
+            if self._stop_evt.is_set():
+                break
+            
+            channel.queue(sound)
+            busy_until += sound.get_length()
+            queued_length = sound.get_length()
+        
+        if self._stop_evt.is_set() or self._stop_evt.wait(timeout=max(0.0, busy_until - time.monotonic())):
+            channel.stop()
+            return None
+        return b"".join(played)
+    
+    def _make_sound(self, pcm: bytes, sample_rate: int) -> "pygame.mixer.Sound":
+        """Create a sound from raw 16-bit mono PCM"""
+        if pygame.mixer.get_init() == (sample_rate, -16, 1):
+            return pygame.mixer.Sound(buffer=pcm)
+        
+        # The mixer runs in a different format, so let it convert from WAV
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(pcm)
+        buffer.seek(0)
+        return pygame.mixer.Sound(file=buffer)
+    
+    def _synthesize_with_command(self, text: str, length_scale: float) -> "pygame.mixer.Sound":
+        """Synthesize with the piper command when the Python package is missing"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
+            audio_file = tmp_file.name
+        
+        try:
+            # An absolute path with close_fds=False lets CPython use posix_spawn instead of fork
             process = subprocess.Popen(
-                ["piper", "--model", self.voice_model, "--output_file", self.current_audio_file, "--length_scale", str(length_scale)],
+                [self._piper_command or "piper", "--model", self.voice_model, "--output_file", audio_file, "--length_scale", str(length_scale)],
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                close_fds=False
             )
             
-            stdout, stderr = process.communicate(input=text)
+            stdout, stderr = process.communicate(input=text.encode("utf-8"))
             
             if process.returncode != 0:
-                raise Exception(f"Piper failed: {stderr}")
+                raise Exception(f"Piper failed: {stderr.decode('utf-8', errors='replace')}")
             
-            pygame.mixer.music.load(self.current_audio_file)
-            pygame.mixer.music.play()
-            
-            while pygame.mixer.music.get_busy() and self.is_playing:
-                pygame.time.Clock().tick(10)
+            return pygame.mixer.Sound(file=audio_file)
         finally:
-            self.is_playing = False
-            if self.current_audio_file and os.path.exists(self.current_audio_file):
+            if os.path.exists(audio_file):
                 try:
-                    os.unlink(self.current_audio_file)
+                    os.unlink(audio_file)
                 except:
                     pass
-            if callback:
-                callback()
     
     def stop(self) -> None:
-        self.is_playing = False
+        self._stop_evt.set()
         if PYGAME_AVAILABLE:
-            pygame.mixer.music.stop()
+            pygame.mixer.stop()
     
     def is_available(self) -> bool:
-        if not PYGAME_AVAILABLE:
-            return False
-        
-        # Check if piper command is available
-        if not self.check_piper_installed():
-            return False
-        
-        return os.path.exists(self.voice_model)
+        if self._available_cached is None:
+            # Needs pygame, the piper package or command, and the voice model
+            self._available_cached = (
+                PYGAME_AVAILABLE
+                and self.check_piper_installed()
+                and os.path.exists(self.get_model_path())
+            )
+        return self._available_cached
     
     def get_name(self) -> str:
         return "Piper TTS"
     
     def check_piper_installed(self) -> bool:
         """Check if Piper is installed"""
-        try:
-            # Try to run piper with --help to see if it's installed
-            result = subprocess.run(["piper", "--help"], capture_output=True, text=True, timeout=2)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-            return False
+        if self._installed_cached is None:
+            # A PATH lookup is enough to find the command, no need to run it
+            self._piper_command = shutil.which("piper")
+            self._installed_cached = PIPER_AVAILABLE or self._piper_command is not None
+        return self._installed_cached
     
     def download_model(self, status_callback: Callable[[str], None]) -> bool:
         """Download the Piper voice model"""
         try:
-            import urllib.request
-            
             os.makedirs(self.piper_dir, exist_ok=True)
             
             model_url = "https://huggingface.co/rhasspy/piper-voices/resolve/main/en/en_US/norman/medium/en_US-norman-medium.onnx"
             config_url = "https://huggingface.co/rhasspy/piper-voices/resolve/main/en/en_US/norman/medium/en_US-norman-medium.onnx.json"
             
-            status_callback("Downloading model file (12MB)...")
-            urllib.request.urlretrieve(model_url, self.voice_model)
+            # Share one keep-alive connection pool across both files when requests is installed
+            with (requests.Session() if REQUESTS_AVAILABLE else contextlib.nullcontext()) as session:
+                status_callback("Downloading model file...")
+                model_verified = self._download_file(
+                    session, model_url, self.voice_model, "Downloading model file", status_callback
+                )
+                
+                status_callback("Downloading config file...")
+                # The config is a small non-LFS file with no advertised digest; it is parsed on load
+                self._download_file(session, config_url, self.voice_config, "Downloading config file", status_callback)
             
-            status_callback("Downloading config file...")
-            urllib.request.urlretrieve(config_url, self.voice_config)
+            if PIPER_AVAILABLE and self.use_int8:
+                status_callback("Optimizing voice model for this CPU...")
+                try:
+                    self.quantize_model()
+                except Exception:
+                    # The FP32 model still works if quantization isn't possible
+                    if os.path.exists(self.voice_model_int8):
+                        os.unlink(self.voice_model_int8)
+            
+            if PIPER_AVAILABLE:
+                # Test-loads the INT8 model and drops it for FP32 if it doesn't work
+                status_callback("Loading voice model...")
+                self.load_voice()
             
-            status_callback("Voice model downloaded successfully!")
+            self._installed_cached = None
+            self._available_cached = None
+            if model_verified:
+                status_callback("Voice model downloaded successfully!")
+            else:
+                status_callback("Voice model downloaded (checksum not available, not verified)")
             return True
         except Exception as e:
             status_callback(f"Download failed: {str(e)}")
             return False
+    
+    def _download_file(self, session, url: str, path: str, label: str, status_callback: Callable[[str], None]) -> bool:
+        """Stream a file to disk in large chunks, returning whether its checksum was verified"""
+        chunk_size = 1 << 20
+        if session is not None:
+            response = session.get(url, stream=True, timeout=30)
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size)
+            all_headers = [r.headers for r in response.history] + [response.headers]
+        else:
+            response = urllib.request.urlopen(url, timeout=30)
+            chunks = iter(lambda: response.read(chunk_size), b"")
+            all_headers = [response.headers]
+        
+        # Hugging Face advertises the SHA-256 of large (LFS) files before redirecting to the CDN
+        expected_sha256 = None
+        for headers in all_headers:
+            linked_etag = (headers.get("X-Linked-Etag") or "").replace("W/", "").strip('"')
+            if len(linked_etag) == 64:
+                expected_sha256 = linked_etag
+                break
+        
+        # Write to a side file so an interrupted download never looks complete
+        partial_path = path + ".part"
+        with response, open(partial_path, "wb") as out_file:
+            total = int(response.headers.get("Content-Length") or 0)
+            # requests transparently decompresses, so only compare sizes for unencoded bodies
+            encoded = response.headers.get("Content-Encoding", "identity") != "identity"
+            downloaded = 0
+            for chunk in chunks:
+                out_file.write(chunk)
+                downloaded += len(chunk)
+                if total:
+                    status_callback(f"{label}... {min(downloaded / total, 1.0):.0%}")
+        
+        if total and not encoded and downloaded != total:
+            os.unlink(partial_path)
+            raise Exception(f"Incomplete download of {os.path.basename(path)} ({downloaded} of {total} bytes), please try again")
+        
+        if expected_sha256 and sha256_file(partial_path) != expected_sha256.lower():
+            os.unlink(partial_path)
+            raise Exception(f"Checksum mismatch for {os.path.basename(path)}, please try again")
+        os.replace(partial_path, path)
+        return expected_sha256 is not None
 
 
 class UnifiedTTSApp:
     """Main application window"""
     
+    # Upper bound on the decoded audio kept for replaying unchanged text
+    PCM_CACHE_BUDGET = 64 * 1024 * 1024
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Text to Speech")
@@ -239,18 +532,64 @@ class UnifiedTTSApp:
         else:
             self.root.minsize(900, 700)
         
+        # Initialize the mixer once, at Piper's native rate so it never resamples,
+        # with a small buffer to keep playback start latency low
+        if PYGAME_AVAILABLE:
+            pygame.mixer.pre_init(frequency=22050, size=-16, channels=1, buffer=MIXER_BUFFER_SAMPLES)
+            pygame.mixer.init()
+        
         # Initialize engines
         self.engines = {
             'google': GoogleTTSEngine(),
             'piper': PiperTTSEngine()
         }
         
+        # One long-lived daemon worker for synthesis, so closing the window never waits on it
+        self._synth_queue = queue.Queue()
+        threading.Thread(target=self._synth_worker, name="tts-synth", daemon=True).start()
+        
+        # Warm up Piper on the synthesis worker while the UI is built
+        self.submit_synth(self._warm_piper)
+        
         self.current_engine = None
         self.is_speaking = False
-        self.speaking_thread = None
+        self._synth_future = None
+        self._speaking_engine = None
+        self._pcm_cache = collections.OrderedDict()
+        self._pcm_cache_bytes = 0
         
         self.create_ui()
         self.check_engines_and_initialize()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    def submit_synth(self, fn, *args, **kwargs) -> concurrent.futures.Future:
+        """Queue a call on the synthesis worker; the returned future can cancel it"""
+        future = concurrent.futures.Future()
+        self._synth_queue.put((future, fn, args, kwargs))
+        return future
+    
+    def _synth_worker(self):
+        """Run queued synthesis calls one at a time, skipping cancelled ones"""
+        while True:
+            future, fn, args, kwargs = self._synth_queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+    
+    def _warm_piper(self):
+        """Run a tiny inference so the first utterance only pays inference time"""
+        piper_engine = self.engines['piper']
+        if piper_engine.sess is None:
+            return
+        
+        try:
+            piper_engine.sess.run(None, piper_engine._dummy_inputs())
+        except Exception:
+            # Warm-up is best effort, the real synthesis will report errors
+            pass
     
     def create_ui(self):
         """Create the user interface"""
@@ -353,6 +692,8 @@ class UnifiedTTSApp:
             ("Korean", "ko"),
             ("Chinese", "zh")
         ]
+        # Codes in dropdown order, looked up by the selected index
+        self._lang_codes = [code for _, code in languages]
         
         self.lang_combo = ttk.Combobox(
             self.lang_frame,
@@ -362,7 +703,7 @@ class UnifiedTTSApp:
             width=25,
             font=("Arial", 11)
         )
-        self.lang_combo.set("English (en)")
+        self.lang_combo.current(0)
         self.lang_combo.pack(side=tk.LEFT, padx=10)
         
         # Speed control
@@ -423,76 +764,53 @@ class UnifiedTTSApp:
     
     def check_engines_and_initialize(self):
         """Check available engines and initialize"""
-        available_engines = []
-        engine_items = []
+        # (engine id, dropdown label, available) in dropdown order
+        self._engine_items: List[Tuple[EngineId, str, bool]] = []
         
         # Check Piper TTS FIRST (so it appears first in dropdown)
         piper_engine = self.engines['piper']
         if piper_engine.is_available():
-            available_engines.append('piper')
-            engine_items.append("Piper TTS (Offline)")
+            self._engine_items.append((EngineId.PIPER, "Piper TTS (Offline)", True))
         elif piper_engine.check_piper_installed():
-            engine_items.append("Piper TTS (Model Not Downloaded)")
+            self._engine_items.append((EngineId.PIPER, "Piper TTS (Model Not Downloaded)", False))
         else:
-            engine_items.append("Piper TTS (Not Installed - pip install piper-tts)")
+            self._engine_items.append((EngineId.PIPER, "Piper TTS (Not Installed - pip install piper-tts~=1.2.0)", False))
         
         # Check Google TTS SECOND
         if self.engines['google'].is_available():
-            available_engines.append('google')
-            engine_items.append("Google TTS (Online)")
+            self._engine_items.append((EngineId.GOOGLE, "Google TTS (Online)", True))
         else:
-            engine_items.append("Google TTS (Not Available - Install gtts & pygame)")
+            self._engine_items.append((EngineId.GOOGLE, "Google TTS (Not Available - Install gtts & pygame)", False))
         
-        self.engine_combo['values'] = engine_items
+        self.engine_combo['values'] = [label for _, label, _ in self._engine_items]
         
         # Always select first item in list (Piper will be first if available)
-        if available_engines:
-            # Select the first available engine in the dropdown
-            self.engine_combo.current(0)
-            
-            # Set the current engine based on what's first
-            first_item = engine_items[0]
-            if "Piper TTS (Offline)" in first_item:
-                self.current_engine = self.engines['piper']
-            elif "Google TTS (Online)" in first_item:
-                self.current_engine = self.engines['google']
-            else:
-                # Neither is fully available, but set based on what's selected
-                for engine_key in available_engines:
-                    if engine_key == 'piper' and "Piper" in first_item:
-                        self.current_engine = self.engines['piper']
-                        break
-                    elif engine_key == 'google' and "Google" in first_item:
-                        self.current_engine = self.engines['google']
-                        break
-            
+        self.engine_combo.current(0)
+        if any(available for _, _, available in self._engine_items):
             self.on_engine_change()
             self.status_label.config(text="Ready", fg="green")
         else:
-            self.engine_combo.current(0)
             self.status_label.config(text="No TTS engines available. Please install dependencies.", fg="red")
             self.play_button.config(state="disabled")
     
     def on_engine_change(self, event=None):
         """Handle engine selection change"""
-        selection = self.engine_combo.get()
+        engine_id, _, available = self._engine_items[self.engine_combo.current()]
         
         # Hide download button by default
         self.download_button.pack_forget()
         
-        if "Google TTS (Online)" in selection:
-            self.current_engine = self.engines['google']
-            self.lang_frame.pack(pady=10)
-            self.play_button.config(state="normal")
-            self.status_label.config(text="Ready - Google TTS", fg="green")
-            
-        elif "Piper TTS (Offline)" in selection:
-            self.current_engine = self.engines['piper']
-            self.lang_frame.pack_forget()
+        if available:
+            self.current_engine = self.engines[engine_id.value]
+            if engine_id is EngineId.GOOGLE:
+                self.lang_frame.pack(pady=10)
+            else:
+                self.lang_frame.pack_forget()
             self.play_button.config(state="normal")
-            self.status_label.config(text="Ready - Piper TTS", fg="green")
+            self.status_label.config(text=f"Ready - {self.current_engine.get_name()}", fg="green")
             
-        elif "Model Not Downloaded" in selection:
+        elif engine_id is EngineId.PIPER and self.engines['piper'].check_piper_installed():
+            # Installed, but the voice model has not been downloaded yet
             self.current_engine = None
             self.lang_frame.pack_forget()
             self.play_button.config(state="disabled")
@@ -503,10 +821,10 @@ class UnifiedTTSApp:
             # Not available
             self.current_engine = None
             self.play_button.config(state="disabled")
-            if "Google" in selection:
+            if engine_id is EngineId.GOOGLE:
                 self.status_label.config(text="Install: pip install gtts pygame", fg="orange")
             else:
-                self.status_label.config(text="Install: pip install piper-tts", fg="orange")
+                self.status_label.config(text="Install: pip install 'piper-tts~=1.2.0'", fg="orange")
     
     def download_piper_model(self):
         """Download Piper voice model"""
@@ -524,6 +842,7 @@ class UnifiedTTSApp:
             else:
                 self.root.after(0, lambda: self.download_button.config(state="normal", text="Download Voice Model"))
         
+        # A daemon thread, so closing the window never waits for a download to finish
         thread = threading.Thread(target=download_thread, daemon=True)
         thread.start()
     
@@ -532,10 +851,12 @@ class UnifiedTTSApp:
         self.download_button.pack_forget()
         self.check_engines_and_initialize()
         
+        # The download built a fresh session, warm it before the first PLAY
+        self.submit_synth(self._warm_piper)
+        
         # Select Piper TTS if now available
-        engine_items = self.engine_combo['values']
-        for i, item in enumerate(engine_items):
-            if "Piper TTS (Offline)" in item:
+        for i, (engine_id, _, available) in enumerate(self._engine_items):
+            if engine_id is EngineId.PIPER and available:
                 self.engine_combo.current(i)
                 self.on_engine_change()
                 break
@@ -572,31 +893,66 @@ class UnifiedTTSApp:
         # Get language if using Google TTS
         kwargs = {'speed': self.speed_var.get(), 'callback': self.reset_ui}
         if isinstance(self.current_engine, GoogleTTSEngine):
-            lang_code = self.lang_combo.get().split("(")[1].split(")")[0]
-            kwargs['language'] = lang_code
+            lang_index = self.lang_combo.current()
+            kwargs['language'] = self._lang_codes[lang_index] if lang_index >= 0 else "en"
+        
+        # Reuse the audio from an earlier identical request if we have it
+        engine = self.current_engine
+        cache_key = hashlib.blake2b(
+            f"{engine.get_name()}|{kwargs['speed']}|{kwargs.get('language', '')}|{text}".encode(),
+            digest_size=16
+        ).digest()
+        cached_pcm = self._pcm_cache.get(cache_key)
+        if cached_pcm is not None:
+            self._pcm_cache.move_to_end(cache_key)
         
         # Start speaking in a separate thread
-        self.speaking_thread = threading.Thread(
-            target=lambda: self.speak_with_error_handling(text, **kwargs)
+        self._speaking_engine = engine
+        self._synth_future = self.submit_synth(
+            self.speak_with_error_handling, engine, text, cache_key, cached_pcm, **kwargs
         )
-        self.speaking_thread.daemon = True
-        self.speaking_thread.start()
     
-    def speak_with_error_handling(self, text, **kwargs):
+    def speak_with_error_handling(self, engine, text, cache_key, cached_pcm, **kwargs):
         """Speak with error handling"""
         try:
-            self.current_engine.speak(text, **kwargs)
+            if cached_pcm is not None:
+                engine.play_pcm(cached_pcm, kwargs['callback'])
+                return
+            
+            pcm = engine.speak(text, **kwargs)
+            if pcm:
+                self.root.after(0, lambda: self.cache_pcm(cache_key, pcm))
         except Exception as e:
             self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to speak: {str(e)}"))
             self.root.after(0, self.reset_ui)
     
+    def cache_pcm(self, cache_key, pcm):
+        """Store synthesized audio, evicting the least recently used entries"""
+        if cache_key in self._pcm_cache or len(pcm) > self.PCM_CACHE_BUDGET:
+            return
+        
+        self._pcm_cache[cache_key] = pcm
+        self._pcm_cache_bytes += len(pcm)
+        while self._pcm_cache_bytes > self.PCM_CACHE_BUDGET:
+            _, evicted = self._pcm_cache.popitem(last=False)
+            self._pcm_cache_bytes -= len(evicted)
+    
     def stop_speaking(self):
         """Stop the current speech"""
         self.is_speaking = False
-        if self.current_engine:
-            self.current_engine.stop()
+        if self._synth_future:
+            # Drops the request if the worker hasn't picked it up yet
+            self._synth_future.cancel()
+        # Stop the engine that is playing, even if the selection changed since
+        if self._speaking_engine:
+            self._speaking_engine.stop()
         self.reset_ui()
     
+    def on_close(self):
+        """Stop playback before closing the window"""
+        self.stop_speaking()
+        self.root.destroy()
+    
     def reset_ui(self):
         """Reset UI to ready state"""
         self.is_speaking = False
@@ -636,13 +992,7 @@ def check_dependencies():
             print(f"✗ {dep} - Not installed")
     
     # Check for Piper (cross-platform)
-    piper_available = False
-    try:
-        result = subprocess.run(["piper", "--help"], capture_output=True, text=True, timeout=2)
-        if result.returncode == 0:
-            piper_available = True
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-        piper_available = False
+    piper_available = PIPER_AVAILABLE or shutil.which("piper") is not None
     
     if piper_available:
         print("✓ piper - Available")
@@ -660,7 +1010,7 @@ def check_dependencies():
             python_deps = [d for d in missing if d in ['gtts', 'pygame']]
             print(f"pip install {' '.join(python_deps)}")
         if 'piper' in missing:
-            print("pip install piper-tts")
+            print('pip install "piper-tts~=1.2.0"')
         print()
     
     if not PYGAME_AVAILABLE: